@@ -3,22 +3,42 @@ StartupNetwork - A simple directory and network map for startups
 Built with FastAPI + Jinja2 templates + JSON storage
 """
 
+import time
+
+# Taken before the heavy imports below, for the time-to-ready report
+STARTED_AT = time.perf_counter()
+
 import os
 import json
 import secrets
 import hashlib
 import re
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import gzip
+import shutil
+import tempfile
+import sqlite3
+import asyncio
+import heapq
+import itertools
+import threading
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterator, Set, Tuple
 from pathlib import Path
 
-from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException, Depends, status
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException, Depends, Query, status
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
-from PIL import Image, ImageOps
-import bcrypt
+from markupsafe import Markup
+
+# Pillow and bcrypt are imported where they are used, so they don't slow down startup
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 # ============================================================================
@@ -31,21 +51,65 @@ LOGO_DIR = DATA_DIR / "logos"
 TEMPLATES_DIR = BASE_DIR / "templates"
 STATIC_DIR = BASE_DIR / "static"
 
-# Ensure directories exist
-DATA_DIR.mkdir(exist_ok=True)
-LOGO_DIR.mkdir(exist_ok=True)
-TEMPLATES_DIR.mkdir(exist_ok=True)
-STATIC_DIR.mkdir(exist_ok=True)
-
 # Files
 USERS_FILE = DATA_DIR / "users.json"
 STARTUPS_FILE = DATA_DIR / "startups.json"
 FIELDS_FILE = DATA_DIR / "fields.json"
 
+
+def shared_session_secret() -> str:
+    """
+    A random session secret kept in data/, so that when SESSION_SECRET is unset
+    every worker still signs cookies with the same key. The first worker to get
+    there creates it; the others read it.
+    """
+    secret_file = DATA_DIR / ".session_secret"
+    DATA_DIR.mkdir(exist_ok=True)
+    if not secret_file.exists():
+        temp_path = secret_file.with_name(f".session_secret.{os.getpid()}")
+        temp_path.write_text(secrets.token_hex(32))
+        temp_path.chmod(0o600)
+        try:
+            os.link(temp_path, secret_file)  # fails if another worker won
+        except FileExistsError:
+            pass
+        finally:
+            temp_path.unlink()
+    return secret_file.read_text()
+
+
 # Environment variables
-SESSION_SECRET = os.getenv("SESSION_SECRET", secrets.token_hex(32))
+SESSION_SECRET = os.getenv("SESSION_SECRET") or shared_session_secret()
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
+FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "512"))
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", str(BASE_DIR / "snapshots")))
+SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", "3600"))  # seconds, 0 disables
+SNAPSHOT_FULL_EVERY = int(os.getenv("SNAPSHOT_FULL_EVERY", "24"))
+# Retention: the newest SNAPSHOT_KEEP snapshots and all from the last SNAPSHOT_KEEP_DAYS
+# days are kept, with the ones they build on. Both 0 keeps everything.
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", "48"))
+SNAPSHOT_KEEP_DAYS = int(os.getenv("SNAPSHOT_KEEP_DAYS", "7"))
+LOGO_GC_INTERVAL = int(os.getenv("LOGO_GC_INTERVAL", "600"))  # seconds, 0 disables
+LOGO_GC_GRACE = int(os.getenv("LOGO_GC_GRACE", "3600"))  # seconds an unreferenced logo is kept
+LOGO_GC_BATCH = int(os.getenv("LOGO_GC_BATCH", "500"))  # files checked per pass
+SIMILAR_TOP_K = int(os.getenv("SIMILAR_TOP_K", "4"))
+SIMILAR_MAX_POSTINGS = int(os.getenv("SIMILAR_MAX_POSTINGS", "50"))  # candidates taken per term
+
+# Rate limits: tokens per second and bucket size, per user (or IP when logged out).
+# A rate of 0 disables the limit.
+WRITE_RATE = float(os.getenv("WRITE_RATE", "5"))
+WRITE_BURST = int(os.getenv("WRITE_BURST", "20"))
+AUTH_RATE = float(os.getenv("AUTH_RATE", "0.2"))
+AUTH_BURST = int(os.getenv("AUTH_BURST", "5"))
+RATE_BUCKETS_MAX = int(os.getenv("RATE_BUCKETS_MAX", "10000"))  # clients tracked per route class
+# Reverse proxies in front of the app that append to X-Forwarded-For. The client IP
+# is the entry the outermost of them added; anything further left is client-supplied.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+# Backpressure: requests are refused with 429 beyond these queue lengths
+WRITE_QUEUE_LIMIT = int(os.getenv("WRITE_QUEUE_LIMIT", "32"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+BCRYPT_QUEUE_LIMIT = int(os.getenv("BCRYPT_QUEUE_LIMIT", "8"))
 
 # Default fields with colors and centroid positions
 DEFAULT_FIELDS = [
@@ -82,7 +146,21 @@ def read_json(file_path: Path, default: Any = None) -> Any:
         return json.load(f)
 
 
-def process_logo_to_square(img: Image.Image, size: int = 512) -> Image.Image:
+def ensure_directories():
+    """Create data and asset directories if missing"""
+    DATA_DIR.mkdir(exist_ok=True)
+    LOGO_DIR.mkdir(exist_ok=True)
+    TEMPLATES_DIR.mkdir(exist_ok=True)
+    STATIC_DIR.mkdir(exist_ok=True)
+
+
+def open_logo_image(file) -> "Image.Image":
+    """Open an uploaded logo (Pillow is loaded on first use)"""
+    from PIL import Image
+    return Image.open(file)
+
+
+def process_logo_to_square(img: "Image.Image", size: int = 512) -> "Image.Image":
     """
     Process logo to fit perfectly in a circular container:
     - Convert to RGB if needed
@@ -90,6 +168,8 @@ def process_logo_to_square(img: Image.Image, size: int = 512) -> Image.Image:
     - Resize to specified size
     - Add subtle padding for better circular display
     """
+    from PIL import Image
+
     # Convert RGBA to RGB with white background if needed
     if img.mode in ('RGBA', 'LA', 'P'):
         background = Image.new('RGB', img.size, (255, 255, 255))
@@ -152,20 +232,1045 @@ def save_fields(fields: List[Dict]):
     atomic_write(FIELDS_FILE, fields)
 
 
+# ============================================================================
+# Field Index
+# ============================================================================
+
+# Inverted index: field name -> ids of the startups tagged with it.
+# Reset by sync_generation when another worker changes the data.
+field_index: Dict[str, Set[str]] = {}
+field_index_built = False
+
+
+def _index_startup(startup: Dict):
+    for field in startup.get('fields', []):
+        field_index.setdefault(field, set()).add(startup['id'])
+
+
+def _unindex_startup(startup: Dict):
+    for field in startup.get('fields', []):
+        ids = field_index.get(field)
+        if ids is None:
+            continue
+        ids.discard(startup['id'])
+        if not ids:
+            del field_index[field]
+
+
+def build_field_index(startups: List[Dict]) -> Dict[str, Set[str]]:
+    """A field index of startups, built from scratch. Touches no shared state"""
+    index: Dict[str, Set[str]] = {}
+    for startup in startups:
+        for field in startup.get('fields', []):
+            index.setdefault(field, set()).add(startup['id'])
+    return index
+
+
+def install_field_index(index: Dict[str, Set[str]]):
+    """Make a built index the current one"""
+    global field_index_built
+    field_index.clear()
+    field_index.update(index)
+    field_index_built = True
+
+
+def rebuild_field_index(startups: List[Dict]):
+    """Rebuild the field index from scratch"""
+    install_field_index(build_field_index(startups))
+
+
+def reset_field_index():
+    """Mark the field index stale so the next read rebuilds it"""
+    global field_index_built
+    field_index.clear()
+    field_index_built = False
+
+
+def ensure_field_index(startups: List[Dict]) -> Dict[str, Set[str]]:
+    """Return the field index, building it from startups if needed"""
+    if not field_index_built:
+        rebuild_field_index(startups)
+    return field_index
+
+
+def update_field_index(old: Optional[Dict] = None, new: Optional[Dict] = None):
+    """
+    Apply a single startup change to the index. Call right after save_startups:
+    - old: the startup as it was before the change (None on create)
+    - new: the startup as saved (None on delete)
+    """
+    if not field_index_built:
+        # Not built yet - the next read builds it from the saved file
+        return
+    if old:
+        _unindex_startup(old)
+    if new:
+        _index_startup(new)
+
+
+def rename_field_in_index(old_name: str, new_name: str):
+    """Move a field's postings to its new name. Call right after save_startups"""
+    if not field_index_built:
+        return
+    ids = field_index.pop(old_name, set())
+    if ids:
+        field_index.setdefault(new_name, set()).update(ids)
+
+
+def filter_ids_by_fields(index: Dict[str, Set[str]], fields: List[str], match: str = "any") -> Set[str]:
+    """Resolve a multi-field filter against the index (match='any' is OR, 'all' is AND)"""
+    postings = [index.get(f, set()) for f in fields]
+    if match == "all":
+        return set.intersection(*postings) if postings else set()
+    return set().union(*postings)
+
+
+def field_facets(index: Dict[str, Set[str]], fields: List[Dict], ids: Optional[Set[str]] = None) -> Dict[str, int]:
+    """Per-field startup counts, optionally restricted to a set of startup ids"""
+    counts = {}
+    for field in fields:
+        postings = index.get(field['name'], set())
+        counts[field['name']] = len(postings) if ids is None else len(postings & ids)
+    return counts
+
+
+def is_coordinate(value: Any) -> bool:
+    """A finite JSON number (not a bool, string or null)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        return False
+
+
+def _map_coordinate(value: Any) -> float:
+    """A stored coordinate as a number; anything else (older or hand-edited data) is 0"""
+    return round(value, 2) if is_coordinate(value) else 0
+
+
+def startups_to_columns(startups: List[Dict], fields: List[Dict]) -> Dict[str, List]:
+    """
+    Columnar form of startups for the map: one list per attribute, with fields
+    given as indexes into the 'fields' list of names. Only what the map draws
+    is included; details are fetched per startup on click.
+    """
+    names = [f['name'] for f in fields]
+    positions = {name: i for i, name in enumerate(names)}
+    field_idx = []
+    for s in startups:
+        idx = []
+        for f in s.get('fields', []):
+            if f not in positions:
+                positions[f] = len(names)
+                names.append(f)
+            idx.append(positions[f])
+        field_idx.append(idx)
+
+    return {
+        'fields': names,
+        'id': [s['id'] for s in startups],
+        'name': [s['startupName'] for s in startups],
+        'x': [_map_coordinate((s.get('position') or {}).get('x')) for s in startups],
+        'y': [_map_coordinate((s.get('position') or {}).get('y')) for s in startups],
+        'fieldIdx': field_idx,
+        'logo': [s.get('logoPath') or '' for s in startups],
+        'owner': [s['owner_username'] for s in startups],
+    }
+
+
+# ============================================================================
+# Similar Startups
+# ============================================================================
+
+# TF-IDF vectors over goal, description and fields, and a precomputed table of
+# each startup's SIMILAR_TOP_K nearest neighbours by cosine similarity. Vectors
+# are sparse (term -> weight) with an inverted term -> {id: weight} index.
+# Candidates for a startup come from the SIMILAR_MAX_POSTINGS strongest postings
+# of each of its terms, and the most promising are then scored exactly. That
+# keeps a full build linear in the number of startups, at the cost of possibly
+# missing neighbours that only share terms many other startups use too.
+#
+# Creates, edits and deletes update the table incrementally; existing vectors
+# keep the IDF weights they were built with until enough startups have changed
+# to warrant a full rebuild. Rebuilds run in a thread while the current table
+# keeps serving, and the new table is swapped in when done.
+
+SIMILAR_STOPWORDS = frozenset("""
+    a about an and are as at be but by can for from has have how in into is it its
+    more most of on or our so that the their them they this to up us we what when
+    which who will with you your
+""".split())
+SIMILAR_TOKEN_RE = re.compile(r"[a-z0-9]+")
+SIMILAR_FIELD_WEIGHT = 2  # a shared field counts like a term used twice
+SIMILAR_QUERY_TERMS = 16  # a startup's strongest terms, used to find candidates
+SIMILAR_SHORTLIST = 4 * SIMILAR_TOP_K  # candidates scored exactly per startup
+
+
+def _empty_similar_tables() -> Dict[str, Any]:
+    return {
+        'terms': {},      # id -> term counts
+        'df': {},         # term -> startups using it
+        'vectors': {},    # id -> unit tf-idf vector
+        'postings': {},   # term -> {id: weight}
+        'heads': {},      # term -> its strongest postings [(weight, id)], built on demand
+        'neighbors': {},  # id -> [(score, id)], best first
+        'cards': {},      # id -> what the detail page shows
+        'stamps': {},     # id -> what tells whether another worker changed it
+        'changes': 0,     # incremental updates since the tables were built
+    }
+
+
+similar = _empty_similar_tables()
+similar_built = False  # False until the first build is swapped in
+similar_rebuild_wanted = False
+similar_sync_wanted = False  # another worker wrote; apply its changes
+similar_rebuild_task: Optional["asyncio.Task"] = None
+# This worker's changes made while the task reads the file, replayed afterwards
+similar_pending: Optional[List[Tuple[Optional[Dict], Optional[Dict]]]] = None
+
+
+def _similar_terms_of(startup: Dict) -> Dict[str, int]:
+    text = f"{startup.get('goalOneSentence', '')} {startup.get('canvasIdeaDescription', '')}".lower()
+    counts: Dict[str, int] = {}
+    for token in SIMILAR_TOKEN_RE.findall(text):
+        if len(token) > 1 and token not in SIMILAR_STOPWORDS:
+            counts[token] = counts.get(token, 0) + 1
+    for field in startup.get('fields', []):
+        counts[f"field:{field}"] = SIMILAR_FIELD_WEIGHT
+    return counts
+
+
+def _similar_vector(tables: Dict[str, Any], terms: Dict[str, int]) -> Dict[str, float]:
+    n = len(tables['terms'])
+    df = tables['df']
+    vector = {t: c * (math.log((1 + n) / (1 + df.get(t, 0))) + 1) for t, c in terms.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {t: w / norm for t, w in vector.items()} if norm else {}
+
+
+def _similar_stamp(startup: Dict) -> Tuple:
+    # Edits set updatedAt; a field rename changes fields only
+    return startup.get('updatedAt'), tuple(startup.get('fields', []))
+
+
+def _similar_change_limit(tables: Dict[str, Any]) -> int:
+    """Incremental changes after which the tables are rebuilt, refreshing IDF weights"""
+    return max(20, len(tables['terms']) // 10)
+
+
+def _similar_card(startup: Dict) -> Dict:
+    return {
+        'id': startup['id'],
+        'startupName': startup['startupName'],
+        'goalOneSentence': startup.get('goalOneSentence', ''),
+        'logoPath': startup.get('logoPath'),
+    }
+
+
+def _set_similar_vector(tables: Dict[str, Any], startup_id: str, vector: Optional[Dict[str, float]]):
+    vectors, postings, heads = tables['vectors'], tables['postings'], tables['heads']
+    for term in vectors.pop(startup_id, {}):
+        term_postings = postings[term]
+        del term_postings[startup_id]
+        if not term_postings:
+            del postings[term]
+        # A head stays valid unless the startup was in it
+        if any(other == startup_id for _, other in heads.get(term, ())):
+            del heads[term]
+    if vector is not None:
+        vectors[startup_id] = vector
+        for term, weight in vector.items():
+            postings.setdefault(term, {})[startup_id] = weight
+            # ...or the startup now belongs in it
+            head = heads.get(term)
+            if head is not None and (len(head) < SIMILAR_MAX_POSTINGS or weight > head[-1][0]):
+                del heads[term]
+
+
+def _posting_head(tables: Dict[str, Any], term: str) -> List[Tuple[float, str]]:
+    """The SIMILAR_MAX_POSTINGS startups a term weighs most in, strongest first"""
+    head = tables['heads'].get(term)
+    if head is None:
+        postings = tables['postings'][term].items()
+        head = heapq.nlargest(SIMILAR_MAX_POSTINGS, ((weight, other) for other, weight in postings))
+        tables['heads'][term] = head
+    return head
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def _similarity_scores(tables: Dict[str, Any], startup_id: str, limit: Optional[int] = None) -> Dict[str, float]:
+    """
+    Cosine similarity of a startup to its candidates: the startups in the posting
+    heads of its strongest terms, or only the `limit` best of them by their
+    partial scores
+    """
+    vector = tables['vectors'].get(startup_id, {})
+    partial: Dict[str, float] = {}
+    for term, weight in heapq.nlargest(SIMILAR_QUERY_TERMS, vector.items(), key=lambda item: item[1]):
+        for other_weight, other in _posting_head(tables, term):
+            partial[other] = partial.get(other, 0.0) + weight * other_weight
+    partial.pop(startup_id, None)
+
+    candidates = partial if limit is None else heapq.nlargest(limit, partial, key=partial.get)
+    vectors = tables['vectors']
+    return {other: _cosine(vector, vectors[other]) for other in candidates}
+
+
+def _top_neighbors(scores: Dict[str, float]) -> List[Tuple[float, str]]:
+    return heapq.nlargest(SIMILAR_TOP_K, ((score, other) for other, score in scores.items()))
+
+
+def build_similar_tables(startups: List[Dict]) -> Dict[str, Any]:
+    """Compute all vectors and neighbour tables from scratch. Touches no shared state"""
+    tables = _empty_similar_tables()
+    for startup in startups:
+        terms = _similar_terms_of(startup)
+        tables['terms'][startup['id']] = terms
+        tables['cards'][startup['id']] = _similar_card(startup)
+        tables['stamps'][startup['id']] = _similar_stamp(startup)
+        for term in terms:
+            tables['df'][term] = tables['df'].get(term, 0) + 1
+    for startup_id, terms in tables['terms'].items():
+        _set_similar_vector(tables, startup_id, _similar_vector(tables, terms))
+    for startup_id in tables['terms']:
+        tables['neighbors'][startup_id] = _top_neighbors(_similarity_scores(tables, startup_id, SIMILAR_SHORTLIST))
+    return tables
+
+
+def _start_similar_task() -> "asyncio.Task":
+    global similar_rebuild_task
+    if similar_rebuild_task is None or similar_rebuild_task.done():
+        similar_rebuild_task = asyncio.get_running_loop().create_task(maintain_similar_index())
+    return similar_rebuild_task
+
+
+def request_similar_rebuild() -> "asyncio.Task":
+    """
+    Rebuild the similarity tables in the background. The current tables keep
+    serving, and taking incremental updates, until the new ones are swapped in.
+    """
+    global similar_rebuild_wanted
+    similar_rebuild_wanted = True
+    return _start_similar_task()
+
+
+def request_similar_sync() -> "asyncio.Task":
+    """Apply other workers' writes to the similarity tables in the background"""
+    global similar_sync_wanted
+    similar_sync_wanted = True
+    return _start_similar_task()
+
+
+async def maintain_similar_index():
+    """Rebuild the tables or apply other workers' changes, until neither is wanted"""
+    global similar_rebuild_wanted, similar_sync_wanted
+    while similar_rebuild_wanted or similar_sync_wanted:
+        if similar_rebuild_wanted or not similar_built:
+            # The build reads the file, so it includes writes made so far
+            similar_rebuild_wanted = similar_sync_wanted = False
+            if not await rebuild_similar_index():
+                return
+        else:
+            similar_sync_wanted = False
+            await sync_similar_index()
+
+
+async def rebuild_similar_index() -> bool:
+    """Build new tables in a thread and swap them in. Returns False on failure"""
+    global similar, similar_built, similar_pending
+    similar_pending = []
+    try:
+        tables = await asyncio.to_thread(lambda: build_similar_tables(get_startups()))
+    except Exception as e:
+        print(f"==> Similar startups rebuild failed: {e}")
+        return False
+    finally:
+        pending, similar_pending = similar_pending, None
+
+    similar = tables
+    similar_built = True
+    # Writes made during the build may not be in the file it read
+    for old, new in pending:
+        _apply_similar_change(similar, old, new)
+    # Cached pages show the old lists
+    invalidate_startup_fragments()
+    return True
+
+
+async def sync_similar_index():
+    """
+    Apply other workers' writes incrementally: startups whose stamp differs from
+    the tables', or that appeared or disappeared, are updated one by one.
+    """
+    global similar_pending
+    # This worker's own changes from here on may be newer than the file read,
+    # so they are replayed last
+    similar_pending = []
+    try:
+        await _apply_foreign_similar_changes()
+    except Exception as e:
+        print(f"==> Similar startups sync failed: {e}")
+    finally:
+        pending, similar_pending = similar_pending, None
+    for old, new in pending:
+        _apply_similar_change(similar, old, new)
+
+
+async def _apply_foreign_similar_changes():
+    startups = await asyncio.to_thread(get_startups)
+    stamps = similar['stamps']
+    live = {s['id'] for s in startups}
+    changes = [({'id': i}, None) for i in stamps if i not in live]
+    changes += [({'id': s['id']}, s) for s in startups if stamps.get(s['id']) != _similar_stamp(s)]
+    if similar['changes'] + len(changes) > _similar_change_limit(similar):
+        # Cheaper to start over
+        request_similar_rebuild()
+        return
+    # In steps, so requests are served in between
+    for old, new in changes:
+        _apply_similar_change(similar, old, new)
+        if similar_rebuild_wanted:
+            return
+        await asyncio.sleep(0)
+
+
+def update_similar_index(old: Optional[Dict] = None, new: Optional[Dict] = None):
+    """
+    Apply a single startup change to the similarity index. Call right after
+    save_startups (old is None on create, new is None on delete).
+    """
+    if similar_pending is not None:
+        similar_pending.append((old, new))
+    if similar_built:
+        _apply_similar_change(similar, old, new)
+
+
+def _apply_similar_change(tables: Dict[str, Any], old: Optional[Dict], new: Optional[Dict]):
+    terms_table, df, neighbors = tables['terms'], tables['df'], tables['neighbors']
+    startup_id = (new or old)['id']
+
+    for term in terms_table.pop(startup_id, {}):
+        df[term] -= 1
+        if not df[term]:
+            del df[term]
+    _set_similar_vector(tables, startup_id, None)
+    neighbors.pop(startup_id, None)
+    tables['cards'].pop(startup_id, None)
+    tables['stamps'].pop(startup_id, None)
+
+    scores: Dict[str, float] = {}
+    if new:
+        terms = _similar_terms_of(new)
+        terms_table[startup_id] = terms
+        for term in terms:
+            df[term] = df.get(term, 0) + 1
+        _set_similar_vector(tables, startup_id, _similar_vector(tables, terms))
+        tables['cards'][startup_id] = _similar_card(new)
+        tables['stamps'][startup_id] = _similar_stamp(new)
+        scores = _similarity_scores(tables, startup_id)
+        neighbors[startup_id] = _top_neighbors(scores)
+
+    # Fix up the tables of the other startups: ones that listed this startup
+    # are recomputed, others take it in if it now ranks high enough
+    for other, table in neighbors.items():
+        if other == startup_id:
+            continue
+        score = scores.get(other, 0.0)
+        if any(n == startup_id for _, n in table):
+            neighbors[other] = _top_neighbors(_similarity_scores(tables, other, SIMILAR_SHORTLIST))
+        elif score > 0 and (len(table) < SIMILAR_TOP_K or (score, startup_id) > table[-1]):
+            neighbors[other] = heapq.nlargest(SIMILAR_TOP_K, table + [(score, startup_id)])
+        else:
+            continue
+        # Its cached page shows the old list
+        invalidate_startup_fragments(other)
+    # So may this startup's own, if rendered before the change reached the tables
+    invalidate_startup_fragments(startup_id)
+
+    tables['changes'] += 1
+    if tables['changes'] > _similar_change_limit(tables):
+        # Refresh IDF weights
+        request_similar_rebuild()
+
+
+def get_similar_startups(startup_id: str, startups: List[Dict]) -> List[Dict]:
+    """The precomputed most similar startups to one startup"""
+    if not similar_built:
+        request_similar_rebuild()
+        return []
+    found = similar['neighbors'].get(startup_id, [])
+    if not similar_rebuild_task.done():
+        # The tables may predate another worker's writes - skip startups that are gone
+        live = {s['id'] for s in startups}
+        found = [n for n in found if n[1] in live]
+    return [similar['cards'][other] for _, other in found]
+
+
+# ============================================================================
+# Multi-Worker Coordination
+# ============================================================================
+
+# Workers (uvicorn --workers N) share data/ but not memory. A generation counter
+# in a small SQLite database is bumped on every write to data the in-memory caches
+# depend on; each worker compares it with the generation its caches reflect and
+# drops them when another worker has written. The database's write lock also
+# serialises read-modify-write cycles on the JSON files across workers.
+
+COORD_DB_FILE = DATA_DIR / "coordination.db"
+
+# Shared generation this worker's in-memory caches reflect (None = unknown)
+local_generation: Optional[int] = None
+_coord_db_ready = False
+# Kept open for the per-request generation check
+_generation_conn: Optional[sqlite3.Connection] = None
+
+
+def coord_connect() -> sqlite3.Connection:
+    """Open the coordination database, creating it on first use"""
+    global _coord_db_ready
+    # Lock connections are opened in a thread and then used on the event loop
+    conn = sqlite3.connect(str(COORD_DB_FILE), timeout=30, isolation_level=None, check_same_thread=False)
+    if not _coord_db_ready:
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+        _coord_db_ready = True
+    return conn
+
+
+def read_generation(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+
+def sync_generation(generation: Optional[int] = None):
+    """Drop in-memory caches if the data changed since this worker last looked"""
+    global local_generation, _generation_conn
+    if generation is None:
+        if _generation_conn is None:
+            _generation_conn = coord_connect()
+        generation = read_generation(_generation_conn)
+    if generation != local_generation:
+        reset_field_index()
+        # A build in progress may have read the file before this write
+        if similar_built or similar_rebuild_task is not None:
+            request_similar_sync()
+        invalidate_startup_fragments()
+        local_generation = generation
+
+
+def _begin_write() -> Tuple[sqlite3.Connection, int]:
+    """Open a connection holding the write lock, waiting for it if needed"""
+    conn = coord_connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        return conn, read_generation(conn)
+    except BaseException:
+        conn.close()
+        raise
+
+
+def _close_begun_write(task: "asyncio.Future"):
+    if not task.cancelled() and task.exception() is None:
+        task.result()[0].close()
+
+
+@asynccontextmanager
+async def data_write_lock(affects_caches: bool = True):
+    """
+    Hold the cross-worker write lock around a read-modify-write of the data files.
+    Re-read the files inside the block. The lock is waited for in a thread, so
+    this worker keeps serving while another worker or a snapshot holds it.
+
+    The generation is bumped when the block exits cleanly, unless affects_caches
+    is False (data no in-memory cache depends on, like map positions), and the
+    transaction is rolled back untouched if the block raises.
+    """
+    global local_generation
+    begin = asyncio.ensure_future(asyncio.to_thread(_begin_write))
+    try:
+        conn, generation = await asyncio.shield(begin)
+    except asyncio.CancelledError:
+        # Release the lock if the thread still gets it
+        begin.add_done_callback(_close_begun_write)
+        raise
+    try:
+        sync_generation(generation)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if affects_caches:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        conn.execute("COMMIT")
+        if affects_caches:
+            # Callers apply their own change to the caches, so they stay current
+            local_generation += 1
+    finally:
+        conn.close()
+
+
+@contextmanager
+def data_read_lock():
+    """Hold off writers in every worker while several data files are read together"""
+    conn = coord_connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        finally:
+            conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# Snapshots
+# ============================================================================
+
+# Point-in-time backups of the data directory, stored under SNAPSHOT_DIR:
+# - manifests/<id>.json.gz: one per snapshot. For each JSON file it holds the
+#   records added or changed since the parent snapshot and the keys removed;
+#   the full key order only if records were reordered rather than appended.
+#   Logos (file name -> content digest) are stored the same way. Every
+#   SNAPSHOT_FULL_EVERY-th snapshot is full, and a snapshot's state is rebuilt
+#   by applying its chain of manifests from the last full one.
+# - manifests/<id>.summary.json: what the snapshot list shows, so listing
+#   doesn't decompress every manifest.
+# - logos/<sha256>.png: logo contents, stored once however many snapshots use them.
+#
+# After each snapshot, ones outside the retention policy are deleted, and so are
+# logo blobs no remaining snapshot uses.
+
+# (name, file, key of a record)
+SNAPSHOT_SOURCES = [
+    ('users', USERS_FILE, 'username'),
+    ('startups', STARTUPS_FILE, 'id'),
+    ('fields', FIELDS_FILE, 'name'),
+]
+SNAPSHOT_ID_FORMAT = '%Y%m%dT%H%M%S%fZ'
+
+
+def _snapshot_manifest_path(snapshot_id: str) -> Path:
+    return SNAPSHOT_DIR / "manifests" / f"{snapshot_id}.json.gz"
+
+
+def _snapshot_summary_path(snapshot_id: str) -> Path:
+    return SNAPSHOT_DIR / "manifests" / f"{snapshot_id}.summary.json"
+
+
+def _snapshot_logo_path(digest: str) -> Path:
+    return SNAPSHOT_DIR / "logos" / f"{digest}.png"
+
+
+def _write_file_atomic(file_path: Path, content: bytes):
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_name(file_path.name + '.tmp')
+    temp_path.write_bytes(content)
+    temp_path.replace(file_path)
+
+
+def list_snapshot_ids() -> List[str]:
+    """Snapshot ids, oldest first"""
+    manifest_dir = SNAPSHOT_DIR / "manifests"
+    if not manifest_dir.exists():
+        return []
+    return sorted(p.name[:-len('.json.gz')] for p in manifest_dir.glob("*.json.gz"))
+
+
+def load_snapshot(snapshot_id: str) -> Dict:
+    with gzip.open(_snapshot_manifest_path(snapshot_id), 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def snapshot_summary(manifest: Dict) -> Dict:
+    return {
+        'id': manifest['id'],
+        'created_at': manifest['created_at'],
+        'parent': manifest['parent'],
+        'changed': {name: len(f['records']) + len(f.get('removed', [])) for name, f in manifest['files'].items()},
+        'logos': manifest.get('logo_count', len(manifest['logos'])),
+    }
+
+
+def load_snapshot_summary(snapshot_id: str) -> Dict:
+    """A snapshot's summary, written from its manifest the first time if missing"""
+    try:
+        return json.loads(_snapshot_summary_path(snapshot_id).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        summary = snapshot_summary(load_snapshot(snapshot_id))
+        _write_file_atomic(_snapshot_summary_path(snapshot_id), json.dumps(summary).encode('utf-8'))
+        return summary
+
+
+def list_snapshot_summaries() -> List[Dict]:
+    """Summaries of all snapshots, newest first"""
+    summaries = []
+    for snapshot_id in reversed(list_snapshot_ids()):
+        try:
+            summaries.append(load_snapshot_summary(snapshot_id))
+        except FileNotFoundError:
+            continue  # pruned meanwhile
+    return summaries
+
+
+def find_snapshot_at(moment: datetime) -> Optional[str]:
+    """Id of the latest snapshot taken at or before a (naive UTC) moment"""
+    ids = [i for i in list_snapshot_ids() if datetime.strptime(i, SNAPSHOT_ID_FORMAT) <= moment]
+    return ids[-1] if ids else None
+
+
+def load_snapshot_state(snapshot_id: str) -> Tuple[Dict[str, str], Dict[str, Dict[str, Dict]]]:
+    """
+    A snapshot's logos (file name -> digest) and, per JSON file, its records by
+    key in file order, rebuilt from the snapshot's chain of manifests
+    """
+    chain = [load_snapshot(snapshot_id)]
+    while chain[-1]['parent']:
+        chain.append(load_snapshot(chain[-1]['parent']))
+
+    logos: Dict[str, str] = {}
+    files: Dict[str, Dict[str, Dict]] = {name: {} for name, _, _ in SNAPSHOT_SOURCES}
+    for manifest in reversed(chain):
+        if 'logos_removed' in manifest:
+            for filename in manifest['logos_removed']:
+                logos.pop(filename, None)
+            logos.update(manifest['logos'])
+        else:
+            # Older manifests list every logo
+            logos = dict(manifest['logos'])
+        for name, _, _ in SNAPSHOT_SOURCES:
+            changes = manifest['files'][name]
+            records = files[name]
+            for key in changes.get('removed', []):
+                records.pop(key, None)
+            # New keys are appended in order; changed ones keep their place
+            records.update(changes['records'])
+            if 'order' in changes:
+                records = {key: records[key] for key in changes['order']}
+            files[name] = records
+    return logos, files
+
+
+def take_snapshot() -> Optional[Dict]:
+    """
+    Take an incremental snapshot of the data files and logos.
+    Returns its manifest, or None if nothing changed since the last snapshot.
+    """
+    ids = list_snapshot_ids()
+    parent = load_snapshot(ids[-1]) if ids else None
+    if parent:
+        known_logos, parent_files = load_snapshot_state(parent['id'])
+    else:
+        known_logos, parent_files = {}, {name: {} for name, _, _ in SNAPSHOT_SOURCES}
+
+    # Read the JSON files while writers are held off, so they and the logos belong
+    # to the same point in time. Logos are never rewritten in place (each upload
+    # gets a new name), so new ones are only hard-linked into a staging directory
+    # under the lock - that keeps them even if deleted meanwhile - and are read,
+    # hashed and stored after it is released.
+    staging = Path(tempfile.mkdtemp(prefix='.snapshot-', dir=DATA_DIR))
+    try:
+        with data_read_lock() as conn:
+            generation = read_generation(conn)
+            data = {}
+            for name, file_path, _ in SNAPSHOT_SOURCES:
+                data[name] = json.loads(file_path.read_text(encoding='utf-8')) if file_path.exists() else []
+            new_logos = set()
+            for startup in data['startups']:
+                filename = startup.get('logoPath')
+                if not filename or filename in known_logos or filename in new_logos:
+                    continue
+                try:
+                    os.link(LOGO_DIR / filename, staging / filename)
+                except FileNotFoundError:
+                    continue
+                except OSError:
+                    # No hard links on this file system
+                    shutil.copyfile(LOGO_DIR / filename, staging / filename)
+                new_logos.add(filename)
+
+        # Store new logos by content
+        logos = {}
+        for startup in data['startups']:
+            filename = startup.get('logoPath')
+            if filename in known_logos:
+                logos[filename] = known_logos[filename]
+            elif filename in new_logos and filename not in logos:
+                content = (staging / filename).read_bytes()
+                digest = hashlib.sha256(content).hexdigest()
+                blob_path = _snapshot_logo_path(digest)
+                if blob_path.exists():
+                    # Now in use again: keep it out of a concurrent sweep
+                    os.utime(blob_path)
+                else:
+                    _write_file_atomic(blob_path, content)
+                logos[filename] = digest
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    full = parent is None or parent['depth'] + 1 >= SNAPSHOT_FULL_EVERY
+    base_logos = {} if full else known_logos
+    changed = logos != known_logos
+    files = {}
+    for name, _, key in SNAPSHOT_SOURCES:
+        current = {str(r[key]): r for r in data[name]}
+        previous = parent_files[name]
+        if current != previous or list(current) != list(previous):
+            changed = True
+        base = {} if full else previous
+        records = {k: r for k, r in current.items() if base.get(k) != r}
+        files[name] = {'records': records, 'removed': [k for k in base if k not in current]}
+        # Applying the changes appends new keys; store the order if that's not enough
+        kept = [k for k in base if k in current]
+        if kept + [k for k in current if k not in base] != list(current):
+            files[name]['order'] = list(current)
+
+    if parent and not changed:
+        return None
+
+    now = datetime.utcnow()
+    manifest = {
+        'id': now.strftime(SNAPSHOT_ID_FORMAT),
+        'created_at': now.isoformat() + 'Z',
+        'generation': generation,
+        'parent': None if full else parent['id'],
+        'depth': 0 if full else parent['depth'] + 1,
+        'files': files,
+        'logos': {f: d for f, d in logos.items() if base_logos.get(f) != d},
+        'logos_removed': [f for f in base_logos if f not in logos],
+        'logo_count': len(logos),
+    }
+    content = json.dumps(manifest, ensure_ascii=False).encode('utf-8')
+    _write_file_atomic(_snapshot_manifest_path(manifest['id']), gzip.compress(content))
+    summary = snapshot_summary(manifest)
+    _write_file_atomic(_snapshot_summary_path(manifest['id']), json.dumps(summary).encode('utf-8'))
+    return manifest
+
+
+def prune_snapshots() -> Dict[str, int]:
+    """
+    Delete snapshots outside the retention policy, keeping those that kept ones
+    build on, then logo blobs no remaining snapshot uses. Returns counts.
+    """
+    if SNAPSHOT_KEEP <= 0 and SNAPSHOT_KEEP_DAYS <= 0:
+        return {'snapshots': 0, 'logos': 0}
+    ids = list_snapshot_ids()
+    # The newest is always kept: the next snapshot builds on it
+    keep = set(ids[-max(SNAPSHOT_KEEP, 1):])
+    if SNAPSHOT_KEEP_DAYS > 0:
+        cutoff = datetime.utcnow() - timedelta(days=SNAPSHOT_KEEP_DAYS)
+        keep.update(i for i in ids if datetime.strptime(i, SNAPSHOT_ID_FORMAT) >= cutoff)
+    for snapshot_id in list(keep):
+        parent = load_snapshot_summary(snapshot_id)['parent']
+        while parent and parent not in keep:
+            keep.add(parent)
+            parent = load_snapshot_summary(parent)['parent']
+
+    removed = [i for i in ids if i not in keep]
+    for snapshot_id in removed:
+        _snapshot_manifest_path(snapshot_id).unlink(missing_ok=True)
+        _snapshot_summary_path(snapshot_id).unlink(missing_ok=True)
+    return {'snapshots': len(removed), 'logos': _sweep_snapshot_logos() if removed else 0}
+
+
+def _sweep_snapshot_logos() -> int:
+    """Delete logo blobs no snapshot uses, unless stored or reused within LOGO_GC_GRACE"""
+    # A snapshot uses the logos its manifest adds and those of the snapshots it
+    # builds on, which are kept with it - so together the manifests list them all
+    used = set()
+    for snapshot_id in list_snapshot_ids():
+        try:
+            used.update(load_snapshot(snapshot_id)['logos'].values())
+        except FileNotFoundError:
+            continue
+    cutoff = time.time() - LOGO_GC_GRACE
+    removed = 0
+    for blob_path in (SNAPSHOT_DIR / "logos").glob("*.png"):
+        if blob_path.stem in used:
+            continue
+        try:
+            if blob_path.stat().st_mtime < cutoff:
+                blob_path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+async def snapshot_now() -> Optional[Dict]:
+    """Take a snapshot and apply the retention policy, off the event loop"""
+    manifest = await asyncio.to_thread(take_snapshot)
+    if manifest:
+        pruned = await asyncio.to_thread(prune_snapshots)
+        if pruned['snapshots']:
+            print(f"==> Pruned {pruned['snapshots']} old snapshots and {pruned['logos']} logos")
+    return manifest
+
+
+def load_snapshot_data(snapshot_id: str) -> Tuple[Dict[str, str], Dict[str, List]]:
+    """A snapshot's logos (file name -> digest) and JSON file contents"""
+    logos, files = load_snapshot_state(snapshot_id)
+    return logos, {name: list(records.values()) for name, records in files.items()}
+
+
+def _restore_snapshot_logos(logos: Dict[str, str]):
+    for filename, digest in logos.items():
+        if not (LOGO_DIR / filename).exists():
+            shutil.copyfile(_snapshot_logo_path(digest), LOGO_DIR / filename)
+
+
+async def restore_snapshot(snapshot_id: str):
+    """
+    Restore the data files and logos to the state of a snapshot. Raises
+    FileNotFoundError if the snapshot, or one it builds on, is gone.
+    """
+    # Decompress and copy in threads, before taking the lock. Logos come first
+    # so the restored records never point at missing files; until then nothing
+    # references them, and logo cleanup leaves new files alone for LOGO_GC_GRACE.
+    logos, data = await asyncio.to_thread(load_snapshot_data, snapshot_id)
+    await asyncio.to_thread(_restore_snapshot_logos, logos)
+
+    async with data_write_lock():
+        for name, file_path, _ in SNAPSHOT_SOURCES:
+            atomic_write(file_path, data[name])
+        reset_field_index()
+        request_similar_rebuild()
+        invalidate_startup_fragments()
+
+
+async def snapshot_loop():
+    """Take a snapshot every SNAPSHOT_INTERVAL seconds, off the event loop"""
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        try:
+            manifest = await snapshot_now()
+            if manifest:
+                print(f"==> Snapshot {manifest['id']} taken")
+        except Exception as e:
+            print(f"==> Snapshot failed: {e}")
+
+
+# ============================================================================
+# Logo Garbage Collection
+# ============================================================================
+
+# Logos are written before the startup record that references them, so a failed
+# or interrupted request can leave files nothing points to. A background pass
+# removes them once they are older than LOGO_GC_GRACE.
+
+# The directory is read lazily by one os.scandir() iterator that each pass
+# advances by LOGO_GC_BATCH entries, so no pass lists the whole directory. A new
+# scan starts once it is exhausted. Passes from the background loop and the API
+# take their batches under a lock, as the iterator isn't thread-safe.
+logo_gc_scan: Optional[Iterator[os.DirEntry]] = None
+logo_gc_scan_lock = threading.Lock()
+logo_gc_stats = {'passes': 0, 'scanned': 0, 'removed': 0, 'reclaimed_bytes': 0}
+
+
+def _next_logo_batch() -> List[os.DirEntry]:
+    global logo_gc_scan
+    with logo_gc_scan_lock:
+        if logo_gc_scan is None:
+            logo_gc_scan = os.scandir(LOGO_DIR)
+        batch = list(itertools.islice(logo_gc_scan, LOGO_GC_BATCH))
+        if len(batch) < LOGO_GC_BATCH:
+            logo_gc_scan.close()
+            logo_gc_scan = None
+        return batch
+
+
+def collect_orphan_logos() -> Dict[str, int]:
+    """
+    Check the next LOGO_GC_BATCH logo files and delete unreferenced ones past the
+    grace period. Returns counts for this pass.
+    """
+    entries = _next_logo_batch()
+
+    cutoff = time.time() - LOGO_GC_GRACE
+    candidates = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if entry.is_file() and stat.st_mtime < cutoff:
+            candidates.append((entry.name, stat.st_size))
+
+    removed = reclaimed = 0
+    if candidates:
+        # Check references with writers held off, so a logo can't gain one
+        # between the check and the unlink
+        with data_read_lock():
+            referenced = {s.get('logoPath') for s in get_startups()}
+            for name, size in candidates:
+                if name in referenced:
+                    continue
+                try:
+                    (LOGO_DIR / name).unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                reclaimed += size
+
+    logo_gc_stats['passes'] += 1
+    logo_gc_stats['scanned'] += len(entries)
+    logo_gc_stats['removed'] += removed
+    logo_gc_stats['reclaimed_bytes'] += reclaimed
+    return {'scanned': len(entries), 'removed': removed, 'reclaimed_bytes': reclaimed}
+
+
+async def logo_gc_loop():
+    """Run a logo garbage collection pass every LOGO_GC_INTERVAL seconds, off the event loop"""
+    while True:
+        await asyncio.sleep(LOGO_GC_INTERVAL)
+        try:
+            result = await asyncio.to_thread(collect_orphan_logos)
+            if result['removed']:
+                print(f"==> Removed {result['removed']} orphaned logos ({result['reclaimed_bytes'] / 1024:.0f} KB)")
+        except Exception as e:
+            print(f"==> Logo cleanup failed: {e}")
+
+
 # ============================================================================
 # Authentication Helpers
 # ============================================================================
 
 def hash_password(password: str) -> str:
     """Hash password using bcrypt"""
+    import bcrypt
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify password against hash"""
+    import bcrypt
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
 
+# bcrypt is deliberately slow, so requests run it on a small pool of its own
+# instead of the event loop
+bcrypt_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+bcrypt_pending = 0
+
+
+async def run_bcrypt(func, *args):
+    """Run hash_password/verify_password on the bcrypt pool, refusing work when it is backed up"""
+    global bcrypt_pending
+    if bcrypt_pending >= BCRYPT_QUEUE_LIMIT:
+        raise too_many_requests(1, "Server busy, try again shortly")
+    bcrypt_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(bcrypt_executor, func, *args)
+    finally:
+        bcrypt_pending -= 1
+
+
 def get_current_user(request: Request) -> Optional[Dict]:
     """Get logged-in user from session"""
     username = request.session.get('username')
@@ -188,12 +1293,130 @@ def is_admin(user: Dict) -> bool:
     return user.get('is_admin', False)
 
 
+# ============================================================================
+# Rate Limiting
+# ============================================================================
+
+# Token buckets per route class, each an LRU of client -> [tokens, last refill time].
+# Each worker keeps its own, so with N workers a client gets up to N times the rate.
+RATE_LIMITS = {
+    'auth': (AUTH_RATE, AUTH_BURST),
+    'write': (WRITE_RATE, WRITE_BURST),
+}
+rate_buckets: Dict[str, "OrderedDict[str, List[float]]"] = {name: OrderedDict() for name in RATE_LIMITS}
+write_pending = 0
+
+
+def too_many_requests(retry_after: float, detail: str = "Too many requests") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+    )
+
+
+def client_ip(request: Request) -> str:
+    """
+    The client's IP. Behind TRUSTED_PROXY_HOPS proxies it's the X-Forwarded-For
+    entry the outermost proxy appended, so a client can't pick its own by
+    sending the header.
+    """
+    if TRUSTED_PROXY_HOPS > 0:
+        forwarded = [ip.strip() for ip in ','.join(request.headers.getlist('x-forwarded-for')).split(',') if ip.strip()]
+        if forwarded:
+            return forwarded[-min(TRUSTED_PROXY_HOPS, len(forwarded))]
+    return request.client.host if request.client else 'unknown'
+
+
+def rate_limit_client(request: Request) -> str:
+    """Who a request is counted against: the logged-in user, else the client IP"""
+    username = request.session.get('username')
+    if username:
+        return f"user:{username}"
+    return f"ip:{client_ip(request)}"
+
+
+def take_token(route_class: str, client: str) -> float:
+    """
+    Take a token from a client's bucket for a route class. Returns 0 if allowed,
+    else seconds until one is available. Runs on the event loop only, so the
+    read-modify-write of a bucket can't interleave.
+    """
+    rate, burst = RATE_LIMITS[route_class]
+    buckets = rate_buckets[route_class]
+    now = time.monotonic()
+
+    bucket = buckets.get(client)
+    if bucket is None:
+        bucket = buckets[client] = [burst, now]
+        # Beyond RATE_BUCKETS_MAX, forget the least recently used buckets once
+        # they have refilled completely - they'd start full anyway
+        while len(buckets) > RATE_BUCKETS_MAX:
+            tokens, last = next(iter(buckets.values()))
+            if tokens + (now - last) * rate < burst:
+                break
+            buckets.popitem(last=False)
+    else:
+        buckets.move_to_end(client)
+
+    tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+    bucket[1] = now
+    if tokens < 1:
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+    bucket[0] = tokens - 1
+    return 0
+
+
+async def limit_auth(request: Request):
+    """Dependency: rate limit signup/login attempts"""
+    if AUTH_RATE > 0:
+        wait = take_token('auth', rate_limit_client(request))
+        if wait:
+            raise too_many_requests(wait)
+    if bcrypt_pending >= BCRYPT_QUEUE_LIMIT:
+        raise too_many_requests(1, "Server busy, try again shortly")
+
+
+async def limit_writes(request: Request):
+    """Dependency: rate limit mutations and refuse them while too many are in flight"""
+    global write_pending
+    if WRITE_RATE > 0:
+        wait = take_token('write', rate_limit_client(request))
+        if wait:
+            raise too_many_requests(wait)
+    if write_pending >= WRITE_QUEUE_LIMIT:
+        raise too_many_requests(1, "Server busy, try again shortly")
+    write_pending += 1
+    try:
+        yield
+    finally:
+        write_pending -= 1
+
+
 # ============================================================================
 # Bootstrap Admin User
 # ============================================================================
 
-def bootstrap_admin():
-    """Create admin user if not exists"""
+def users_file_stamp() -> Optional[int]:
+    try:
+        return USERS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def bootstrap_admin(conn: sqlite3.Connection):
+    """
+    Create admin user if not exists.
+    The coordination database remembers the users.json version the admin was last
+    seen in, so a normal restart costs a stat() instead of reading every user.
+    """
+    marker = f"admin_seen:{ADMIN_USERNAME}"
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (marker,)).fetchone()
+    stamp = users_file_stamp()
+    if row and stamp is not None and row[0] == stamp:
+        return
+
     users = get_users()
     if not any(u['username'] == ADMIN_USERNAME for u in users):
         users.append({
@@ -206,6 +1429,8 @@ def bootstrap_admin():
         save_users(users)
         print(f"==> Admin user created: {ADMIN_USERNAME}")
 
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (marker, users_file_stamp()))
+
 
 # ============================================================================
 # Validation Helpers
@@ -290,18 +1515,83 @@ def validate_startup_data(data: Dict) -> List[str]:
     return errors
 
 
+# ============================================================================
+# Startup
+# ============================================================================
+
+async def warm_caches():
+    """Build the indexes and compile templates in threads, off the event loop"""
+    started = time.perf_counter()
+
+    generation = local_generation
+    index = await asyncio.to_thread(lambda: build_field_index(get_startups()))
+    # Skip if the data changed or a request built the index meanwhile -
+    # it's then built (or already was) from the current file on first read
+    if local_generation == generation and not field_index_built:
+        install_field_index(index)
+
+    await asyncio.to_thread(compile_templates)
+    await request_similar_rebuild()
+
+    print(f"==> Caches warmed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Seed data, then serve while caches warm up in the background"""
+    print("==> Starting StartupNetwork...")
+    ensure_directories()
+
+    # Every worker runs this; the write lock makes the first one seed the
+    # data and the rest find it already there. No in-memory cache depends on
+    # users or fields, so a (re)starting worker leaves the others' caches alone.
+    async with data_write_lock(affects_caches=False) as conn:
+        bootstrap_admin(conn)
+
+        # Ensure fields.json has defaults
+        fields = get_fields()
+        if not fields:
+            save_fields(DEFAULT_FIELDS.copy())
+
+    print(f"==> Data directory: {DATA_DIR}")
+    print(f"==> Ready in {(time.perf_counter() - STARTED_AT) * 1000:.0f} ms at http://localhost:8000")
+
+    tasks = [asyncio.create_task(warm_caches())]
+    if SNAPSHOT_INTERVAL > 0:
+        tasks.append(asyncio.create_task(snapshot_loop()))
+    if LOGO_GC_INTERVAL > 0:
+        tasks.append(asyncio.create_task(logo_gc_loop()))
+    yield
+    for task in tasks:
+        task.cancel()
+    bcrypt_executor.shutdown(wait=False)
+
+
 # ============================================================================
 # FastAPI App Setup
 # ============================================================================
 
-app = FastAPI(title="StartupNetwork")
+app = FastAPI(title="StartupNetwork", lifespan=lifespan)
 
 # Add session middleware
 app.add_middleware(SessionMiddleware, secret_key=SESSION_SECRET)
 
-# Mount static files
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-app.mount("/data/logos", StaticFiles(directory=str(LOGO_DIR)), name="logos")
+# Mount static files (directories are created on startup)
+app.mount("/static", StaticFiles(directory=str(STATIC_DIR), check_dir=False), name="static")
+app.mount("/data/logos", StaticFiles(directory=str(LOGO_DIR), check_dir=False), name="logos")
+
+
+# Served straight from disk, so they don't need the generation check
+UNCACHED_PATHS = ("/static/", "/data/logos/")
+
+
+@app.middleware("http")
+async def sync_worker_caches(request: Request, call_next):
+    """Pick up data written by other workers before handling the request"""
+    if not request.url.path.startswith(UNCACHED_PATHS):
+        sync_generation()
+    return await call_next(request)
+
 
 # Templates
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
@@ -319,6 +1609,90 @@ def get_initials(name: str) -> str:
 templates.env.filters['initials'] = get_initials
 
 
+def compile_templates():
+    """Load every template into Jinja's cache"""
+    for path in TEMPLATES_DIR.glob("*.html"):
+        templates.get_template(path.name)
+
+
+# ============================================================================
+# Fragment Cache
+# ============================================================================
+
+# Rendered HTML keyed by tuples like ('startup', id, updatedAt, role) or
+# ('home', username). Each entry keeps the HTML and its gzipped bytes;
+# least recently used entries are evicted past FRAGMENT_CACHE_SIZE.
+fragment_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+fragment_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def get_fragment(key: tuple, count: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached fragment. Hits and misses are counted per response, so
+    lookups of fragments nested in a page being rendered pass count=False.
+    """
+    entry = fragment_cache.get(key)
+    if entry is None:
+        if count:
+            fragment_cache_stats['misses'] += 1
+        return None
+    fragment_cache.move_to_end(key)
+    if count:
+        fragment_cache_stats['hits'] += 1
+    return entry
+
+
+def put_fragment(key: tuple, html: str) -> Dict[str, Any]:
+    """Store rendered HTML (plus gzipped bytes) and return the entry"""
+    raw = html.encode('utf-8')
+    entry = {'html': html, 'size': len(raw), 'gzip': gzip.compress(raw)}
+    fragment_cache[key] = entry
+    fragment_cache.move_to_end(key)
+    while len(fragment_cache) > FRAGMENT_CACHE_SIZE:
+        fragment_cache.popitem(last=False)
+    return entry
+
+
+def invalidate_startup_fragments(startup_id: Optional[str] = None):
+    """Drop cached fragments of one startup, or of all startups if no id is given"""
+    for key in list(fragment_cache):
+        if key[0] == 'startup' and (startup_id is None or key[1] == startup_id):
+            del fragment_cache[key]
+
+
+def cached_html_response(request: Request, entry: Dict[str, Any]) -> Response:
+    """Serve a cached page, using the precompressed bytes when the client accepts gzip"""
+    headers = {'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        return Response(content=entry['gzip'], media_type='text/html', headers=headers)
+    return HTMLResponse(content=entry['html'], headers=headers)
+
+
+def user_role(user: Optional[Dict], startup: Dict) -> str:
+    """Role of a user towards a startup, which decides the edit controls shown"""
+    if not user:
+        return 'viewer'
+    if is_admin(user):
+        return 'admin'
+    if startup['owner_username'] == user['username']:
+        return 'owner'
+    return 'viewer'
+
+
+def render_startup_content(key: tuple, startup: Dict, role: str, count: bool = True) -> Markup:
+    """Startup detail body for a role, rendered once per startup version"""
+    entry = get_fragment(key, count)
+    if entry is None:
+        html = templates.get_template("startup_detail_content.html").render(
+            startup=startup,
+            can_edit=role in ('owner', 'admin'),
+            is_admin=role == 'admin'
+        )
+        entry = put_fragment(key, html)
+    return Markup(entry['html'])
+
+
 # ============================================================================
 # Routes - Auth
 # ============================================================================
@@ -332,7 +1706,7 @@ async def signup_page(request: Request):
     })
 
 
-@app.post("/signup")
+@app.post("/signup", dependencies=[Depends(limit_auth)])
 async def signup(
     request: Request,
     username: str = Form(...),
@@ -360,23 +1734,34 @@ async def signup(
 
     # Check if username exists
     users = get_users()
-    if any(u['username'] == username for u in users):
+    taken = any(u['username'] == username for u in users)
+
+    if not taken:
+        # Hash before taking the write lock - bcrypt is slow
+        password_hash = await run_bcrypt(hash_password, password)
+
+        # Create user (checked again under the lock, another worker may have taken it).
+        # No cache depends on the user list, so other workers' caches stay valid
+        async with data_write_lock(affects_caches=False):
+            users = get_users()
+            taken = any(u['username'] == username for u in users)
+            if not taken:
+                users.append({
+                    'username': username,
+                    'password_hash': password_hash,
+                    'email': email,
+                    'is_admin': False,
+                    'created_at': datetime.utcnow().isoformat() + 'Z'
+                })
+                save_users(users)
+
+    if taken:
         return templates.TemplateResponse("signup.html", {
             "request": request,
             "error": "Username already taken",
             "current_user": None
         })
 
-    # Create user
-    users.append({
-        'username': username,
-        'password_hash': hash_password(password),
-        'email': email,
-        'is_admin': False,
-        'created_at': datetime.utcnow().isoformat() + 'Z'
-    })
-    save_users(users)
-
     # Auto-login
     request.session['username'] = username
 
@@ -392,7 +1777,7 @@ async def login_page(request: Request):
     })
 
 
-@app.post("/login")
+@app.post("/login", dependencies=[Depends(limit_auth)])
 async def login(
     request: Request,
     username: str = Form(...),
@@ -402,7 +1787,7 @@ async def login(
     users = get_users()
     user = next((u for u in users if u['username'] == username), None)
 
-    if not user or not verify_password(password, user['password_hash']):
+    if not user or not await run_bcrypt(verify_password, password, user['password_hash']):
         return templates.TemplateResponse("login.html", {
             "request": request,
             "error": "Invalid username or password",
@@ -427,10 +1812,17 @@ async def logout(request: Request):
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Main page with network map"""
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "current_user": get_current_user(request)
-    })
+    # The page only varies by who is logged in - the map loads its data via the API
+    current_user = get_current_user(request)
+    key = ('home', current_user['username'] if current_user else None)
+    entry = get_fragment(key)
+    if entry is None:
+        html = templates.get_template("index.html").render(
+            request=request,
+            current_user=current_user
+        )
+        entry = put_fragment(key, html)
+    return cached_html_response(request, entry)
 
 
 # ============================================================================
@@ -448,7 +1840,7 @@ async def new_startup_page(request: Request, user: Dict = Depends(require_login)
     })
 
 
-@app.post("/startup/new")
+@app.post("/startup/new", dependencies=[Depends(limit_writes)])
 async def create_startup(
     request: Request,
     user: Dict = Depends(require_login),
@@ -494,7 +1886,7 @@ async def create_startup(
                 logo_path = LOGO_DIR / logo_filename
 
                 # Read and process to square with padding for circular display
-                img = Image.open(logo.file)
+                img = open_logo_image(logo.file)
                 img = process_logo_to_square(img, size=512)
                 img.save(logo_path, "PNG")
 
@@ -504,6 +1896,10 @@ async def create_startup(
 
     # If errors, show form again
     if errors:
+        # Don't leave the processed logo behind
+        if logo_path:
+            (LOGO_DIR / logo_path).unlink(missing_ok=True)
+
         all_fields = get_fields()
         return templates.TemplateResponse("startup_new.html", {
             "request": request,
@@ -542,9 +1938,12 @@ async def create_startup(
         startup['logoPath'] = logo_path
 
     # Save
-    startups = get_startups()
-    startups.append(startup)
-    save_startups(startups)
+    async with data_write_lock():
+        startups = get_startups()
+        startups.append(startup)
+        save_startups(startups)
+        update_field_index(new=startup)
+        update_similar_index(new=startup)
 
     return RedirectResponse(url=f"/startup/{startup_id}", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -559,15 +1958,33 @@ async def view_startup(request: Request, startup_id: str):
         raise HTTPException(status_code=404, detail="Startup not found")
 
     current_user = get_current_user(request)
-    can_edit = False
-    if current_user:
-        can_edit = startup['owner_username'] == current_user['username'] or is_admin(current_user)
+    role = user_role(current_user, startup)
+    key = ('startup', startup_id, startup['updatedAt'], role)
+    similar = get_similar_startups(startup_id, startups)
+
+    # Anonymous visitors all get the same page, so cache it whole
+    if not current_user:
+        page_key = key + ('page',)
+        entry = get_fragment(page_key)
+        if entry is None:
+            # The page miss is already counted
+            content = render_startup_content(key, startup, role, count=False)
+            html = templates.get_template("startup_detail.html").render(
+                request=request,
+                current_user=None,
+                startup=startup,
+                content=content,
+                similar=similar
+            )
+            entry = put_fragment(page_key, html)
+        return cached_html_response(request, entry)
 
     return templates.TemplateResponse("startup_detail.html", {
         "request": request,
         "current_user": current_user,
         "startup": startup,
-        "can_edit": can_edit
+        "content": render_startup_content(key, startup, role),
+        "similar": similar
     })
 
 
@@ -593,7 +2010,7 @@ async def edit_startup_page(request: Request, startup_id: str, user: Dict = Depe
     })
 
 
-@app.post("/startup/{startup_id}/edit")
+@app.post("/startup/{startup_id}/edit", dependencies=[Depends(limit_writes)])
 async def update_startup(
     request: Request,
     startup_id: str,
@@ -638,8 +2055,8 @@ async def update_startup(
     # Validate
     errors = validate_startup_data(data)
 
-    # Handle logo upload
-    logo_path = startup.get('logoPath')
+    # Handle logo upload (the old logo is deleted only once the update is saved)
+    logo_path = None
     if logo:
         content_type = logo.content_type
         if content_type not in ['image/png', 'image/jpeg', 'image/jpg', 'image/webp']:
@@ -649,22 +2066,20 @@ async def update_startup(
                 logo_filename = f"{secrets.token_hex(16)}.png"
                 new_logo_path = LOGO_DIR / logo_filename
 
-                img = Image.open(logo.file)
+                img = open_logo_image(logo.file)
                 img = process_logo_to_square(img, size=512)
                 img.save(new_logo_path, "PNG")
 
-                # Delete old logo
-                if logo_path:
-                    old_path = LOGO_DIR / logo_path
-                    if old_path.exists():
-                        old_path.unlink()
-
                 logo_path = logo_filename
             except Exception as e:
                 errors.append(f"Error processing logo: {str(e)}")
 
     # If errors, show form again
     if errors:
+        # Don't leave the processed logo behind
+        if logo_path:
+            (LOGO_DIR / logo_path).unlink(missing_ok=True)
+
         all_fields = get_fields()
         return templates.TemplateResponse("startup_edit.html", {
             "request": request,
@@ -675,37 +2090,53 @@ async def update_startup(
             "form_data": data
         })
 
-    # Update startup
-    startup['startupName'] = startupName.strip()
-    startup['goalOneSentence'] = goalOneSentence.strip()
-    startup['websiteUrl'] = websiteUrl.strip()
-    startup['canvasIdeaDescription'] = canvasIdeaDescription.strip()
-    startup['fields'] = fields
-    startup['founder'] = {
-        'name': founder_name.strip(),
-        'linkedinUrl': founder_linkedin.strip()
-    }
-    startup['updatedAt'] = datetime.utcnow().isoformat() + 'Z'
-
-    if cofounder_name.strip():
-        startup['cofounder'] = {
-            'name': cofounder_name.strip(),
-            'linkedinUrl': cofounder_linkedin.strip()
+    # Update startup (re-read under the lock so writes from other workers aren't lost)
+    async with data_write_lock():
+        startups = get_startups()
+        startup_idx = next((i for i, s in enumerate(startups) if s['id'] == startup_id), None)
+
+        if startup_idx is None:
+            raise HTTPException(status_code=404, detail="Startup not found")
+
+        startup = startups[startup_idx]
+        old_startup = dict(startup)
+        startup['startupName'] = startupName.strip()
+        startup['goalOneSentence'] = goalOneSentence.strip()
+        startup['websiteUrl'] = websiteUrl.strip()
+        startup['canvasIdeaDescription'] = canvasIdeaDescription.strip()
+        startup['fields'] = fields
+        startup['founder'] = {
+            'name': founder_name.strip(),
+            'linkedinUrl': founder_linkedin.strip()
         }
-    else:
-        startup.pop('cofounder', None)
+        startup['updatedAt'] = datetime.utcnow().isoformat() + 'Z'
 
-    if logo_path:
-        startup['logoPath'] = logo_path
+        if cofounder_name.strip():
+            startup['cofounder'] = {
+                'name': cofounder_name.strip(),
+                'linkedinUrl': cofounder_linkedin.strip()
+            }
+        else:
+            startup.pop('cofounder', None)
 
-    # Save
-    startups[startup_idx] = startup
-    save_startups(startups)
+        if logo_path:
+            startup['logoPath'] = logo_path
+
+        # Save
+        startups[startup_idx] = startup
+        save_startups(startups)
+        update_field_index(old=old_startup, new=startup)
+        update_similar_index(old=old_startup, new=startup)
+        invalidate_startup_fragments(startup_id)
+
+        # Delete old logo
+        if logo_path and old_startup.get('logoPath'):
+            (LOGO_DIR / old_startup['logoPath']).unlink(missing_ok=True)
 
     return RedirectResponse(url=f"/startup/{startup_id}", status_code=status.HTTP_303_SEE_OTHER)
 
 
-@app.post("/startup/{startup_id}/delete")
+@app.post("/startup/{startup_id}/delete", dependencies=[Depends(limit_writes)])
 async def delete_startup(
     request: Request,
     startup_id: str,
@@ -715,23 +2146,27 @@ async def delete_startup(
     if not is_admin(user):
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    startups = get_startups()
-    startup_idx = next((i for i, s in enumerate(startups) if s['id'] == startup_id), None)
+    async with data_write_lock():
+        startups = get_startups()
+        startup_idx = next((i for i, s in enumerate(startups) if s['id'] == startup_id), None)
 
-    if startup_idx is None:
-        raise HTTPException(status_code=404, detail="Startup not found")
+        if startup_idx is None:
+            raise HTTPException(status_code=404, detail="Startup not found")
 
-    startup = startups[startup_idx]
+        startup = startups[startup_idx]
 
-    # Delete logo if exists
-    if startup.get('logoPath'):
-        logo_path = LOGO_DIR / startup['logoPath']
-        if logo_path.exists():
-            logo_path.unlink()
+        # Delete logo if exists
+        if startup.get('logoPath'):
+            logo_path = LOGO_DIR / startup['logoPath']
+            if logo_path.exists():
+                logo_path.unlink()
 
-    # Remove from list
-    startups.pop(startup_idx)
-    save_startups(startups)
+        # Remove from list
+        startups.pop(startup_idx)
+        save_startups(startups)
+        update_field_index(old=startup)
+        update_similar_index(old=startup)
+        invalidate_startup_fragments(startup_id)
 
     return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -743,10 +2178,25 @@ async def delete_startup(
 @app.get("/api/startups")
 async def api_get_startups(
     search: Optional[str] = None,
-    field: Optional[str] = None
+    field: Optional[List[str]] = Query(None),
+    match: str = "any",
+    facets: bool = False,
+    format: str = "full"
 ):
-    """Get all startups (with optional filters)"""
+    """
+    Get all startups (with optional filters)
+    - field: may be repeated; match='any' returns startups in any of them, 'all' in every one
+    - facets: wrap the result as {"startups": [...], "facets": {field: count}}
+    - format='columns': compact map payload, see startups_to_columns
+    """
+    if match not in ("any", "all"):
+        raise HTTPException(status_code=400, detail="match must be 'any' or 'all'")
+    if format not in ("full", "columns"):
+        raise HTTPException(status_code=400, detail="format must be 'full' or 'columns'")
+
     startups = get_startups()
+    all_fields = get_fields()
+    index = ensure_field_index(startups)
 
     # Filter by search
     if search:
@@ -757,51 +2207,111 @@ async def api_get_startups(
             or search_lower in s.get('canvasIdeaDescription', '').lower()
         ]
 
-    # Filter by field
-    if field:
-        startups = [s for s in startups if field in s.get('fields', [])]
+    # Facet counts reflect the search but not the field filter, so the UI
+    # can show how many results each field chip would add
+    facet_counts = None
+    if facets:
+        search_ids = {s['id'] for s in startups} if search else None
+        facet_counts = field_facets(index, all_fields, search_ids)
 
+    # Filter by fields
+    if field:
+        ids = filter_ids_by_fields(index, field, match)
+        startups = [s for s in startups if s['id'] in ids]
+
+    if format == "columns":
+        columns = startups_to_columns(startups, all_fields)
+        if facets:
+            columns['facets'] = facet_counts
+        # Plain lists of primitives - skip FastAPI's per-item encoding pass
+        return JSONResponse(columns)
+
+    if facets:
+        return {'startups': startups, 'facets': facet_counts}
     return startups
 
 
+@app.get("/api/startups/{startup_id}")
+async def api_get_startup(startup_id: str):
+    """Get a single startup"""
+    startups = get_startups()
+    startup = next((s for s in startups if s['id'] == startup_id), None)
+
+    if not startup:
+        raise HTTPException(status_code=404, detail="Startup not found")
+
+    return startup
+
+
 @app.get("/api/fields")
 async def api_get_fields():
     """Get all fields"""
     return get_fields()
 
 
-@app.post("/api/startups/{startup_id}/position")
+async def read_json_object(request: Request) -> Dict:
+    """The request's JSON body, which must be an object"""
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Expected a JSON object")
+    return data
+
+
+def json_string(data: Dict, key: str) -> str:
+    """An optional string member of a JSON body ('' if missing)"""
+    value = data.get(key, '')
+    if not isinstance(value, str):
+        raise HTTPException(status_code=400, detail=f"'{key}' must be a string")
+    return value
+
+
+async def read_position(request: Request) -> Tuple[Dict, float, float]:
+    """The JSON body of a position update and its x and y, which must be finite numbers"""
+    data = await read_json_object(request)
+    coordinates = []
+    for key in ('x', 'y'):
+        value = data.get(key)
+        if not is_coordinate(value):
+            raise HTTPException(status_code=400, detail=f"'{key}' must be a finite number")
+        coordinates.append(value)
+    return data, coordinates[0], coordinates[1]
+
+
+@app.post("/api/startups/{startup_id}/position", dependencies=[Depends(limit_writes)])
 async def api_update_position(
     startup_id: str,
     request: Request,
     user: Dict = Depends(require_login)
 ):
     """Update startup position on map"""
-    data = await request.json()
-    x = data.get('x', 0)
-    y = data.get('y', 0)
+    _, x, y = await read_position(request)
 
-    startups = get_startups()
-    startup_idx = next((i for i, s in enumerate(startups) if s['id'] == startup_id), None)
+    # Positions are only read from the file, so other workers' caches stay valid
+    async with data_write_lock(affects_caches=False):
+        startups = get_startups()
+        startup_idx = next((i for i, s in enumerate(startups) if s['id'] == startup_id), None)
 
-    if startup_idx is None:
-        raise HTTPException(status_code=404, detail="Startup not found")
+        if startup_idx is None:
+            raise HTTPException(status_code=404, detail="Startup not found")
 
-    startup = startups[startup_idx]
+        startup = startups[startup_idx]
 
-    # Check ownership
-    if startup['owner_username'] != user['username'] and not is_admin(user):
-        raise HTTPException(status_code=403, detail="Not authorized")
+        # Check ownership
+        if startup['owner_username'] != user['username'] and not is_admin(user):
+            raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Update position
-    startup['position'] = {'x': x, 'y': y}
-    startups[startup_idx] = startup
-    save_startups(startups)
+        # Update position
+        startup['position'] = {'x': x, 'y': y}
+        startups[startup_idx] = startup
+        save_startups(startups)
 
     return {'status': 'ok'}
 
 
-@app.post("/api/fields/position")
+@app.post("/api/fields/position", dependencies=[Depends(limit_writes)])
 async def api_update_field_position(
     request: Request,
     user: Dict = Depends(require_login)
@@ -810,25 +2320,155 @@ async def api_update_field_position(
     if not is_admin(user):
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    data = await request.json()
-    field_name = data.get('name', '')
-    x = data.get('x', 0)
-    y = data.get('y', 0)
+    data, x, y = await read_position(request)
+    field_name = json_string(data, 'name')
 
-    fields = get_fields()
-    field_idx = next((i for i, f in enumerate(fields) if f['name'] == field_name), None)
+    async with data_write_lock(affects_caches=False):
+        fields = get_fields()
+        field_idx = next((i for i, f in enumerate(fields) if f['name'] == field_name), None)
 
-    if field_idx is None:
-        raise HTTPException(status_code=404, detail="Field not found")
+        if field_idx is None:
+            raise HTTPException(status_code=404, detail="Field not found")
 
-    # Update position
-    fields[field_idx]['x'] = x
-    fields[field_idx]['y'] = y
-    save_fields(fields)
+        # Update position
+        fields[field_idx]['x'] = x
+        fields[field_idx]['y'] = y
+        save_fields(fields)
 
     return {'status': 'ok'}
 
 
+@app.post("/api/fields/rename", dependencies=[Depends(limit_writes)])
+async def api_rename_field(
+    request: Request,
+    user: Dict = Depends(require_login)
+):
+    """Rename a field and retag its startups (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    data = await read_json_object(request)
+    old_name = json_string(data, 'name')
+    new_name = json_string(data, 'new_name').strip()
+
+    if not new_name:
+        raise HTTPException(status_code=400, detail="New field name is required")
+
+    async with data_write_lock():
+        fields = get_fields()
+        field_idx = next((i for i, f in enumerate(fields) if f['name'] == old_name), None)
+
+        if field_idx is None:
+            raise HTTPException(status_code=404, detail="Field not found")
+
+        if new_name != old_name and any(f['name'] == new_name for f in fields):
+            raise HTTPException(status_code=400, detail="Field name already taken")
+
+        # Update field
+        fields[field_idx]['name'] = new_name
+        save_fields(fields)
+
+        # Retag startups
+        startups = get_startups()
+        for startup in startups:
+            if old_name in startup.get('fields', []):
+                startup['fields'] = [new_name if f == old_name else f for f in startup['fields']]
+        save_startups(startups)
+        rename_field_in_index(old_name, new_name)
+        request_similar_rebuild()
+        invalidate_startup_fragments()
+
+    return {'status': 'ok'}
+
+
+@app.get("/api/cache/stats")
+async def api_cache_stats(user: Dict = Depends(require_login)):
+    """Fragment cache metrics (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    hits = fragment_cache_stats['hits']
+    misses = fragment_cache_stats['misses']
+    return {
+        'entries': len(fragment_cache),
+        'max_entries': FRAGMENT_CACHE_SIZE,
+        'bytes': sum(e['size'] for e in fragment_cache.values()),
+        'gzip_bytes': sum(len(e['gzip']) for e in fragment_cache.values()),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / (hits + misses) if hits + misses else 0.0
+    }
+
+
+@app.get("/api/snapshots")
+async def api_list_snapshots(user: Dict = Depends(require_login)):
+    """List data snapshots, newest first (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return await asyncio.to_thread(list_snapshot_summaries)
+
+
+@app.post("/api/snapshots", dependencies=[Depends(limit_writes)])
+async def api_take_snapshot(user: Dict = Depends(require_login)):
+    """Take a snapshot now (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    manifest = await snapshot_now()
+    return {'status': 'ok', 'snapshot': snapshot_summary(manifest) if manifest else None}
+
+
+@app.post("/api/snapshots/restore", dependencies=[Depends(limit_writes)])
+async def api_restore_snapshot(
+    request: Request,
+    user: Dict = Depends(require_login)
+):
+    """Restore a snapshot by id, or the latest one taken at or before 'at' (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    data = await read_json_object(request)
+    snapshot_id = json_string(data, 'id')
+    at = json_string(data, 'at')
+    if not snapshot_id and at:
+        try:
+            moment = datetime.fromisoformat(at.replace('Z', '+00:00'))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid 'at' timestamp")
+        if moment.tzinfo:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        snapshot_id = await asyncio.to_thread(find_snapshot_at, moment)
+
+    if not snapshot_id or snapshot_id not in await asyncio.to_thread(list_snapshot_ids):
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    try:
+        await restore_snapshot(snapshot_id)
+    except FileNotFoundError:
+        # Pruned since it was listed
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return {'status': 'ok', 'snapshot': snapshot_id}
+
+
+@app.get("/api/logos/gc")
+async def api_logo_gc_stats(user: Dict = Depends(require_login)):
+    """Totals of the orphaned logo cleanup since startup (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return logo_gc_stats
+
+
+@app.post("/api/logos/gc", dependencies=[Depends(limit_writes)])
+async def api_run_logo_gc(user: Dict = Depends(require_login)):
+    """Run an orphaned logo cleanup pass now (admin only)"""
+    if not is_admin(user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return await asyncio.to_thread(collect_orphan_logos)
+
+
 # ============================================================================
 # Admin Page
 # ============================================================================
@@ -850,25 +2490,7 @@ async def admin_page(request: Request, user: Dict = Depends(require_login)):
     })
 
 
-# ============================================================================
-# Startup
-# ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize app on startup"""
-    print("==> Starting StartupNetwork...")
-    bootstrap_admin()
-
-    # Ensure fields.json has defaults
-    fields = get_fields()
-    if not fields:
-        save_fields(DEFAULT_FIELDS.copy())
-
-    print(f"==> Data directory: {DATA_DIR}")
-    print(f"==> Ready at http://localhost:8000")
-
-
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run("main:app" if workers > 1 else app, host="0.0.0.0", port=8000, workers=workers)
@@ -0,0 +1,152 @@
+"""
+Helpers for the scripts in this directory: run the app from a scratch copy
+(so data/ and snapshots/ never touch the checkout) and talk to it over HTTP
+with nothing but the standard library.
+"""
+
+import http.cookiejar
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Background jobs off, so they don't interfere with what a script measures
+QUIET_ENV = {
+    'SNAPSHOT_INTERVAL': '0',
+    'LOGO_GC_INTERVAL': '0',
+    'ADMIN_USERNAME': 'admin',
+    'ADMIN_PASSWORD': 'admin123',
+}
+
+STARTUP_FORM = {
+    'goalOneSentence': 'Helping small teams ship faster',
+    'canvasIdeaDescription': 'A platform that connects founders with the tools, data and people '
+                             'they need to validate an idea and reach their first customers.',
+    'founder_name': 'Test Founder',
+    'founder_linkedin': 'https://linkedin.com/in/test-founder',
+}
+
+
+def make_app_dir() -> Path:
+    """Copy the app into a fresh temporary directory"""
+    app_dir = Path(tempfile.mkdtemp(prefix='startupnetwork-'))
+    shutil.copy(REPO_DIR / 'main.py', app_dir / 'main.py')
+    shutil.copytree(REPO_DIR / 'templates', app_dir / 'templates')
+    if (REPO_DIR / 'static').exists():
+        shutil.copytree(REPO_DIR / 'static', app_dir / 'static')
+    return app_dir
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class Server:
+    """uvicorn serving a scratch copy of the app"""
+
+    def __init__(self, workers: int = 1, env: Optional[Dict[str, str]] = None, app_dir: Optional[Path] = None):
+        self.app_dir = app_dir or make_app_dir()
+        self.port = free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.log_path = self.app_dir / 'server.log'
+        self.workers = workers
+        self.env = dict(os.environ, **QUIET_ENV, **(env or {}))
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = 60) -> float:
+        """Start the server; returns seconds until it answered a request"""
+        started = time.perf_counter()
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1',
+             '--port', str(self.port), '--workers', str(self.workers)],
+            cwd=self.app_dir, env=self.env,
+            stdout=open(self.log_path, 'w'), stderr=subprocess.STDOUT
+        )
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'server exited:\n{self.log()}')
+            try:
+                with urllib.request.urlopen(self.base_url + '/api/fields', timeout=1):
+                    return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.02)
+        raise RuntimeError(f'server not ready after {timeout}s:\n{self.log()}')
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=30)
+
+    def log(self) -> str:
+        return self.log_path.read_text() if self.log_path.exists() else ''
+
+    def __enter__(self) -> 'Server':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        shutil.rmtree(self.app_dir, ignore_errors=True)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Client:
+    """A browser-like client: keeps the session cookie, doesn't follow redirects"""
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None):
+        self.base_url = base_url
+        self.headers = headers or {}
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect
+        )
+
+    def request(self, method: str, path: str, form: Optional[Dict] = None, json_body: Any = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        body = None
+        all_headers = dict(self.headers, **(headers or {}))
+        if form is not None:
+            body = urllib.parse.urlencode(form, doseq=True).encode()
+            all_headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            all_headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + path, data=body, method=method, headers=all_headers)
+        try:
+            with self.opener.open(req, timeout=60) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def get_json(self, path: str) -> Any:
+        status, _, body = self.request('GET', path)
+        if status != 200:
+            raise RuntimeError(f'GET {path} -> {status}: {body[:200]!r}')
+        return json.loads(body)
+
+    def login(self, username: str = 'admin', password: str = 'admin123') -> int:
+        status, _, _ = self.request('POST', '/login', form={'username': username, 'password': password})
+        return status
+
+    def create_startup(self, name: str, fields) -> Tuple[int, Optional[str]]:
+        """Returns the status and the new startup's id"""
+        status, headers, _ = self.request('POST', '/startup/new', form=dict(STARTUP_FORM, startupName=name, fields=fields))
+        location = headers.get('location') or headers.get('Location') or ''
+        return status, location.rsplit('/', 1)[-1] if status == 303 else None
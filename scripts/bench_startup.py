@@ -0,0 +1,129 @@
+"""
+Startup-time benchmark.
+
+Seeds a scratch copy of the app with synthetic startups and measures, over
+several runs:
+
+- import: `python -c "import main"` (module load, no server)
+- first run: uvicorn start until the first answered request, on fresh data
+  (seeds the admin user, which costs a bcrypt hash)
+- restart: the same, with the admin already there
+- warm-up: from the first answered request until the background cache warm-up
+  (field index, templates, similar startups) is done, and the slowest request
+  answered meanwhile - it stays low because the warm-up runs off the event loop
+
+    python scripts/bench_startup.py --runs 5 --startups 2000
+
+Reports the median and the best of each.
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _harness import Server, make_app_dir  # noqa: E402
+
+FIELDS = ['AI /ML', 'Education', 'Sport', 'Security', 'Food', 'Media', 'Data', 'Health Care']
+WORDS = ("ai machine learning health patients doctors school students teachers football fitness "
+         "athletes security cloud encryption food recipes farm video streaming media data analytics "
+         "dashboard platform marketplace community mobile payments energy climate logistics").split()
+
+
+def synthetic_startups(n: int):
+    rng = random.Random(1)
+    startups = []
+    for i in range(n):
+        words = rng.sample(WORDS, 8)
+        startups.append({
+            'id': f'{i:016x}',
+            'startupName': f'Startup {i}',
+            'goalOneSentence': ' '.join(words[:4]),
+            'websiteUrl': '',
+            'canvasIdeaDescription': (' '.join(words) + ' ') * 3,
+            'fields': rng.sample(FIELDS, rng.randint(1, 3)),
+            'founder': {'name': 'Founder', 'linkedinUrl': 'https://linkedin.com/in/founder'},
+            'owner_username': 'admin',
+            'createdAt': '2026-01-28T12:00:00Z',
+            'updatedAt': '2026-01-28T12:00:00Z',
+            'position': {'x': rng.uniform(0, 100), 'y': rng.uniform(0, 100)},
+        })
+    return startups
+
+
+def time_import(app_dir: Path) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import main'], cwd=app_dir, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def time_warm_up(server: Server, timeout: float = 300):
+    """Seconds until the warm-up is logged as done, and the slowest request meanwhile"""
+    started = time.perf_counter()
+    slowest = 0.0
+    while 'Caches warmed' not in server.log():
+        if time.perf_counter() - started > timeout:
+            raise RuntimeError(f'warm-up not done after {timeout}s:\n{server.log()}')
+        t = time.perf_counter()
+        with urllib.request.urlopen(server.base_url + '/api/fields', timeout=60):
+            pass
+        slowest = max(slowest, time.perf_counter() - t)
+        time.sleep(0.01)
+    warmed_ms = float(re.search(r'Caches warmed in (\d+) ms', server.log()).group(1))
+    return warmed_ms / 1000, slowest
+
+
+def report(label: str, values, unit: str = 's'):
+    scale = 1000 if unit == 'ms' else 1
+    print(f"  {label:<28} median {statistics.median(values) * scale:8.{0 if unit == 'ms' else 2}f} {unit}"
+          f"   best {min(values) * scale:8.{0 if unit == 'ms' else 2}f} {unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--startups', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    startups = json.dumps(synthetic_startups(args.startups))
+    results = {k: [] for k in ('import', 'first run', 'restart', 'warm-up', 'slowest request')}
+    for run in range(args.runs):
+        app_dir = make_app_dir()
+        try:
+            (app_dir / 'data').mkdir()
+            (app_dir / 'data' / 'startups.json').write_text(startups, encoding='utf-8')
+            results['import'].append(time_import(app_dir))
+
+            for label in ('first run', 'restart'):
+                server = Server(workers=args.workers, app_dir=app_dir)
+                try:
+                    results[label].append(server.start())
+                    if label == 'restart':
+                        warmed, slowest = time_warm_up(server)
+                        results['warm-up'].append(warmed)
+                        results['slowest request'].append(slowest)
+                finally:
+                    server.stop()
+        finally:
+            shutil.rmtree(app_dir, ignore_errors=True)
+        print(f"run {run + 1}/{args.runs}: " + ', '.join(f"{k} {v[-1]:.2f}s" for k, v in results.items()))
+
+    print(f"\n{args.startups} startups, {args.workers} worker(s), {args.runs} runs")
+    report('import main', results['import'])
+    report('first run to first response', results['first run'])
+    report('restart to first response', results['restart'])
+    report('cache warm-up', results['warm-up'])
+    report('slowest request in warm-up', results['slowest request'], 'ms')
+
+
+if __name__ == '__main__':
+    main()
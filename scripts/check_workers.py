@@ -0,0 +1,165 @@
+"""
+Multi-worker consistency check.
+
+Starts the app with several uvicorn workers on a scratch copy of the data,
+hammers it with concurrent creates, map drags, a field rename and deletes,
+and checks after each round that every worker serves the same, complete data:
+no lost writes, no stale field index or facet counts, admin seeded once.
+Also checks that map drags don't invalidate other workers' caches, and that
+a worker keeps answering while a write waits for the cross-worker lock.
+
+    python scripts/check_workers.py --workers 4 --startups 120 --clients 16
+
+Exits non-zero if any check fails.
+"""
+
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _harness import Client, Server  # noqa: E402
+
+FIELDS = ['AI /ML', 'Education', 'Sport', 'Security', 'Food', 'Media', 'Data', 'Health Care']
+
+failures = []
+
+
+def check(condition: bool, message: str):
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def read_everywhere(base_url: str, reads: int):
+    """The startup list and facets as seen by many requests (spread over the workers)"""
+    client = Client(base_url)
+    results = []
+    for _ in range(reads):
+        data = client.get_json('/api/startups?facets=true')
+        results.append(({s['id']: s for s in data['startups']}, data['facets']))
+    return results
+
+
+def expect_state(base_url: str, reads: int, ids: set, facets: dict, label: str):
+    seen = read_everywhere(base_url, reads)
+    check(all(set(startups) == ids for startups, _ in seen),
+          f"{label}: all {reads} reads list exactly the {len(ids)} expected startups")
+    check(all(f == facets for _, f in seen), f"{label}: all {reads} reads agree on facets {facets}")
+    return seen[-1][0]
+
+
+def read_generation(server: Server) -> int:
+    with sqlite3.connect(str(server.app_dir / 'data' / 'coordination.db')) as conn:
+        return conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+
+def check_lock_wait(server: Server, client: Client, hold: float = 2.0):
+    """While the write lock is held elsewhere, reads still answer and a write waits for it"""
+    conn = sqlite3.connect(str(server.app_dir / 'data' / 'coordination.db'), isolation_level=None, check_same_thread=False)
+    conn.execute("BEGIN IMMEDIATE")
+    threading.Timer(hold, lambda: conn.execute("ROLLBACK")).start()
+
+    write = {}
+    writer = threading.Thread(target=lambda: write.update(
+        status=client.create_startup("Written after the lock", ['Food'])[0], done=time.perf_counter()))
+    started = time.perf_counter()
+    writer.start()
+    time.sleep(0.2)  # the write is now waiting for the lock in some worker
+    slowest = 0.0
+    for _ in range(server.workers * 5):
+        t = time.perf_counter()
+        client.get_json('/api/fields')
+        client.request('GET', '/')
+        slowest = max(slowest, time.perf_counter() - t)
+    writer.join()
+    conn.close()
+    check(slowest < hold / 4, f"lock: reads answered in at most {slowest * 1000:.0f} ms while the lock was held for {hold:.0f} s")
+    check(write['status'] == 303 and write['done'] - started >= hold * 0.9, "lock: a write waited for the lock, then succeeded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--startups', type=int, default=120)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--reads', type=int, default=40, help='reads per consistency check')
+    args = parser.parse_args()
+
+    # Rate limits off: this checks consistency, not throttling
+    env = {'WRITE_RATE': '0', 'AUTH_RATE': '0', 'WRITE_QUEUE_LIMIT': '10000'}
+    with Server(workers=args.workers, env=env) as server, ThreadPoolExecutor(args.clients) as pool:
+        print(f"Serving {server.base_url} with {args.workers} workers")
+        check(read_generation(server) == 0, "startup: seeding left the cache generation alone")
+        clients = [Client(server.base_url) for _ in range(args.clients)]
+        for client in clients:
+            client.login()
+
+        # Concurrent creates
+        planned = [(f"Startup {i}", [FIELDS[i % len(FIELDS)]]) for i in range(args.startups)]
+        results = list(pool.map(lambda i: clients[i % args.clients].create_startup(*planned[i]), range(args.startups)))
+        ids = {startup_id for status, startup_id in results if status == 303}
+        check(len(ids) == args.startups, f"create: {len(ids)}/{args.startups} creates succeeded")
+        facets = {f: sum(1 for _, fields in planned if f in fields) for f in FIELDS}
+        startups = expect_state(server.base_url, args.reads, ids, facets, "after creates")
+
+        # Concurrent map drags: one startup each, plus everyone dragging the same one
+        id_list = sorted(ids)
+        contested = id_list[0]
+        moves = {startup_id: (10 + i % 80, 90 - i % 80) for i, startup_id in enumerate(id_list[1:])}
+
+        def drag(i):
+            client = clients[i % args.clients]
+            codes = [client.request('POST', f'/api/startups/{contested}/position', json_body={'x': 50 + i % 10, 'y': 50})[0]]
+            if i < len(id_list) - 1:
+                startup_id = id_list[i + 1]
+                x, y = moves[startup_id]
+                codes.append(client.request('POST', f'/api/startups/{startup_id}/position', json_body={'x': x, 'y': y})[0])
+            return codes
+
+        generation = read_generation(server)
+        codes = [c for batch in pool.map(drag, range(max(args.startups, args.clients))) for c in batch]
+        check(all(c == 200 for c in codes), f"drag: {len(codes)} position updates answered 200")
+        check(read_generation(server) == generation, "drag: position updates left the cache generation alone")
+        startups = expect_state(server.base_url, args.reads, ids, facets, "after drags")
+        check(all(startups[i]['position'] == {'x': x, 'y': y} for i, (x, y) in moves.items()),
+              "drag: every startup kept its own last position (no lost updates)")
+        check(startups[contested]['position']['x'] in range(50, 60), "drag: contested startup has one of the sent positions")
+
+        # Rename a field in one worker; every worker's field index must follow
+        status, _, _ = clients[0].request('POST', '/api/fields/rename', json_body={'name': 'Data', 'new_name': 'Data Science'})
+        check(status == 200, "rename: Data -> Data Science answered 200")
+        facets['Data Science'] = facets.pop('Data')
+        facets = {f['name']: facets[f['name']] for f in Client(server.base_url).get_json('/api/fields')}
+        expect_state(server.base_url, args.reads, ids, facets, "after rename")
+        data_science = Client(server.base_url).get_json('/api/startups?field=Data+Science')
+        check(len(data_science) == facets['Data Science'], "rename: filtering by the new name finds every retagged startup")
+
+        # Concurrent deletes
+        doomed = id_list[:args.startups // 4]
+        codes = list(pool.map(lambda i: clients[i % args.clients].request('POST', f'/startup/{doomed[i]}/delete')[0], range(len(doomed))))
+        check(all(c == 303 for c in codes), f"delete: {len(doomed)} deletes succeeded")
+        ids -= set(doomed)
+        for startup_id in doomed:
+            for field in startups[startup_id]['fields']:
+                facets['Data Science' if field == 'Data' else field] -= 1
+        expect_state(server.base_url, args.reads, ids, facets, "after deletes")
+
+        # A write blocked on the lock must not stall the worker it landed in
+        check_lock_wait(server, clients[0])
+        ids.add(Client(server.base_url).get_json('/api/startups?search=Written+after')[0]['id'])
+        facets['Food'] += 1
+        expect_state(server.base_url, args.reads, ids, facets, "after the lock wait")
+
+        check(server.log().count('Admin user created') == 1, "startup: admin user seeded exactly once")
+
+    print(f"\n{'FAILED: ' + str(len(failures)) + ' check(s)' if failures else 'All checks passed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
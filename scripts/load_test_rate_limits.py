@@ -0,0 +1,187 @@
+"""
+Rate limit and backpressure load test.
+
+Starts the app on a scratch copy of the data with small limits, as if behind
+one reverse proxy (TRUSTED_PROXY_HOPS=1), and drives it over HTTP:
+
+- bursts of login attempts and writes beyond the limits answer 429 with a
+  Retry-After, and succeed again once it has passed
+- prepending addresses to X-Forwarded-For doesn't give a client a fresh bucket
+- write traffic from many clients doesn't reset anyone's auth bucket
+- writes beyond WRITE_QUEUE_LIMIT in flight, and password checks beyond
+  BCRYPT_QUEUE_LIMIT, are refused with 429 instead of queueing
+- reads keep answering quickly throughout
+
+    python scripts/load_test_rate_limits.py --clients 3000
+
+Exits non-zero if any check fails.
+"""
+
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from _harness import Client, Server  # noqa: E402
+
+# Auth refills slowly, so an exhausted bucket outlasts the write flood
+AUTH_RATE, AUTH_BURST = 0.05, 3
+WRITE_RATE, WRITE_BURST = 2, 5
+RATE_BUCKETS_MAX = 1000
+
+failures = []
+
+
+def check(condition: bool, message: str):
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def burst(pool: ThreadPoolExecutor, send, n: int):
+    """Send n requests at once; returns their (status, headers)"""
+    return [(status, headers) for status, headers, _ in pool.map(lambda i: send(i), range(n))]
+
+
+def summarize(results) -> str:
+    codes = [status for status, _ in results]
+    return ', '.join(f"{codes.count(c)}x{c}" for c in sorted(set(codes)))
+
+
+def retry_afters(results):
+    return [int(headers.get('Retry-After') or headers.get('retry-after') or 0) for status, headers in results if status == 429]
+
+
+def from_ip(ip: str, spoofed: str = '') -> dict:
+    """Headers as the proxy would send them: it appends the address it saw"""
+    return {'X-Forwarded-For': f"{spoofed}, {ip}" if spoofed else ip}
+
+
+def wrong_login(client: Client, headers: dict):
+    return client.request('POST', '/login', form={'username': 'admin', 'password': 'wrong'}, headers=headers)
+
+
+def check_auth(server: Server, pool: ThreadPoolExecutor):
+    print("Auth limits")
+    client = Client(server.base_url)
+    ip = '203.0.113.10'
+    n = AUTH_BURST * 4
+    results = burst(pool, lambda i: wrong_login(client, from_ip(ip)), n)
+    allowed = sum(1 for status, _ in results if status != 429)
+    check(AUTH_BURST <= allowed <= AUTH_BURST + 1, f"login burst of {n} from one IP: {summarize(results)}")
+    waits = retry_afters(results)
+    check(bool(waits) and all(1 <= w <= AUTH_BURST / AUTH_RATE + 1 for w in waits), f"every 429 has a Retry-After in seconds: {sorted(set(waits))}")
+
+    spoofed = burst(pool, lambda i: wrong_login(client, from_ip(ip, spoofed=f'198.51.100.{i}')), 10)
+    check(all(status == 429 for status, _ in spoofed), f"spoofed X-Forwarded-For entries get no fresh bucket: {summarize(spoofed)}")
+    other = wrong_login(client, from_ip('203.0.113.11'))[0]
+    check(other != 429, f"another client IP is not limited: {other}")
+
+    time.sleep(max(waits) if waits else 1)
+    status = wrong_login(client, from_ip(ip))[0]
+    check(status != 429, f"after Retry-After the next attempt goes through: {status}")
+    return ip
+
+
+def check_writes(server: Server, pool: ThreadPoolExecutor, startup_id: str, clients: int, auth_ip: str):
+    print("Write limits")
+    admin = Client(server.base_url)
+    admin.login()
+    path = f'/api/startups/{startup_id}/position'
+    n = WRITE_BURST * 4
+    results = burst(pool, lambda i: admin.request('POST', path, json_body={'x': i, 'y': i}), n)
+    allowed = sum(1 for status, _ in results if status == 200)
+    check(WRITE_BURST <= allowed <= WRITE_BURST + 2 and allowed + len(retry_afters(results)) == n,
+          f"position burst of {n} from one user: {summarize(results)}")
+    waits = retry_afters(results)
+    check(bool(waits) and all(w >= 1 for w in waits), f"every 429 has a Retry-After in seconds: {sorted(set(waits))}")
+    time.sleep(max(waits) if waits else 1)
+    status = admin.request('POST', path, json_body={'x': 1, 'y': 1})[0]
+    check(status == 200, f"after Retry-After the next write goes through: {status}")
+
+    # Writes from more clients than the bucket table keeps, while reads go on
+    exhausted = burst(pool, lambda i: wrong_login(Client(server.base_url), from_ip(auth_ip)), AUTH_BURST * 2)
+    exhausted_until = time.perf_counter() + min(retry_afters(exhausted) or [0]) - 1
+    anonymous = Client(server.base_url)
+    latencies = []
+    stop = threading.Event()
+
+    def read():
+        reader = Client(server.base_url)
+        while not stop.is_set():
+            started = time.perf_counter()
+            reader.request('GET', '/api/startups?format=columns')
+            latencies.append(time.perf_counter() - started)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    started = time.perf_counter()
+    results = burst(pool, lambda i: anonymous.request(
+        'POST', path, json_body={'x': 1, 'y': 1}, headers=from_ip(f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}')), clients)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reader.join()
+    check(all(status != 429 for status, _ in results), f"{clients} anonymous writers each get their own bucket: {summarize(results)} in {elapsed:.1f} s")
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    check(p95 < 0.5, f"reads during the write flood: {len(latencies)} reads, p95 {p95 * 1000:.0f} ms")
+    if time.perf_counter() < exhausted_until:
+        status = wrong_login(Client(server.base_url), from_ip(auth_ip))[0]
+        check(status == 429, f"an exhausted auth bucket survives the write flood: {status}")
+    else:
+        print("  skip the flood outlasted the auth bucket's Retry-After; try fewer --clients")
+
+
+def check_backpressure(pool: ThreadPoolExecutor, queue_limit: int = 4):
+    print("Backpressure")
+    env = {'WRITE_RATE': '0', 'AUTH_RATE': '0', 'WRITE_QUEUE_LIMIT': str(queue_limit),
+           'BCRYPT_WORKERS': '1', 'BCRYPT_QUEUE_LIMIT': '2'}
+    with Server(env=env) as server:
+        admin = Client(server.base_url)
+        admin.login()
+        _, startup_id = admin.create_startup("Backpressure", ['Data'])
+
+        # Hold the write lock so writes stay in flight
+        conn = sqlite3.connect(str(server.app_dir / 'data' / 'coordination.db'), isolation_level=None, check_same_thread=False)
+        conn.execute("BEGIN IMMEDIATE")
+        threading.Timer(2, lambda: conn.execute("ROLLBACK")).start()
+        n = queue_limit * 3
+        results = burst(pool, lambda i: admin.request('POST', f'/api/startups/{startup_id}/position', json_body={'x': i, 'y': i}), n)
+        conn.close()
+        check(sum(1 for status, _ in results if status == 200) == queue_limit and retry_afters(results) == [1] * (n - queue_limit),
+              f"{n} writes against a held lock, {queue_limit} allowed in flight: {summarize(results)}, Retry-After 1")
+
+        results = burst(pool, lambda i: wrong_login(Client(server.base_url), {}), 20)
+        refused = retry_afters(results)
+        check(bool(refused) and all(w == 1 for w in refused), f"20 concurrent logins against 1 bcrypt thread: {summarize(results)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, default=3 * RATE_BUCKETS_MAX, help='distinct clients in the write flood')
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    env = {'AUTH_RATE': str(AUTH_RATE), 'AUTH_BURST': str(AUTH_BURST),
+           'WRITE_RATE': str(WRITE_RATE), 'WRITE_BURST': str(WRITE_BURST),
+           'RATE_BUCKETS_MAX': str(RATE_BUCKETS_MAX), 'WRITE_QUEUE_LIMIT': '10000', 'TRUSTED_PROXY_HOPS': '1'}
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        with Server(env=env) as server:
+            print(f"Serving {server.base_url}")
+            admin = Client(server.base_url)
+            admin.login()
+            _, startup_id = admin.create_startup("Load test", ['Data'])
+            auth_ip = check_auth(server, pool)
+            check_writes(server, pool, startup_id, args.clients, auth_ip)
+        check_backpressure(pool)
+
+    print(f"\n{'FAILED: ' + str(len(failures)) + ' check(s)' if failures else 'All checks passed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()